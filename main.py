@@ -45,14 +45,13 @@ from pathlib import Path
 # Configurar la ruta para imports locales
 sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    from src.gui.main_window import YouTubeDownloaderGUI
-    from src.core.downloader import YouTubeDownloader
-    from src.core.config import LOGGING_CONFIG
-    from src.utils.helpers import is_valid_youtube_url
-    import logging.config
-except ImportError as e:
-    print(f"❌ Error importando módulos: {e}")
+# Los módulos de la aplicación (yt-dlp, tkinter) se importan solo en el modo
+# que los necesita, para que --help y --version respondan al instante.
+
+
+def report_import_error(error: ImportError):
+    """Informar de un módulo faltante y terminar"""
+    print(f"❌ Error importando módulos: {error}")
     print("📋 Asegúrate de que todas las dependencias estén instaladas:")
     print("   pip install yt-dlp")
     print("   pip install -r requirements.txt")
@@ -62,6 +61,8 @@ except ImportError as e:
 def setup_logging():
     """Configurar sistema de logging"""
     try:
+        import logging.config
+        from src.core.config import LOGGING_CONFIG
         logging.config.dictConfig(LOGGING_CONFIG)
     except Exception:
         # Configuración básica si falla la configuración avanzada
@@ -71,7 +72,8 @@ def setup_logging():
         )
 
 
-def run_cli_mode(url: str, output_format: str = 'mp3', quality: str = '192', output_path: str = None):
+def run_cli_mode(url: str, output_format: str = 'mp3', quality: str = '192', output_path: str = None,
+                 concurrency: int = 4, use_cache: bool = True, keep_metadata: bool = True):
     """
     Ejecutar descarga en modo línea de comandos
     
@@ -80,7 +82,16 @@ def run_cli_mode(url: str, output_format: str = 'mp3', quality: str = '192', out
         output_format (str): Formato de salida
         quality (str): Calidad de descarga
         output_path (str): Ruta de salida
+        concurrency (int): Descargas simultáneas en playlists
+        use_cache (bool): Reutilizar la información ya extraída de la URL
+        keep_metadata (bool): Guardar .info.json y miniatura incrustada
     """
+    try:
+        from src.core.downloader import YouTubeDownloader
+        from src.utils.helpers import is_valid_youtube_url, format_file_size
+    except ImportError as e:
+        report_import_error(e)
+        
     print("🎵 YouTube Downloader - Modo Línea de Comandos")
     print("=" * 50)
     
@@ -90,12 +101,13 @@ def run_cli_mode(url: str, output_format: str = 'mp3', quality: str = '192', out
         return False
     
     # Crear instancia del descargador
-    downloader = YouTubeDownloader(output_path or "./descargas")
+    downloader = YouTubeDownloader(output_path or "./descargas", use_info_cache=use_cache)
     
     # Configurar callback de progreso simple
     def progress_callback(data):
         if data['status'] == 'downloading':
-            print(f"\r📥 Descargando: {data.get('percent', '0%')} - {data.get('speed', '')}", end='', flush=True)
+            speed = format_file_size(int(data.get('speed', 0)))
+            print(f"\r📥 Descargando: {data.get('percent', 0.0):.1f}% - {speed}/s", end='', flush=True)
         elif data['status'] == 'finished':
             print(f"\n✅ Completado: {Path(data.get('filename', '')).name}")
     
@@ -115,13 +127,16 @@ def run_cli_mode(url: str, output_format: str = 'mp3', quality: str = '192', out
         print(f"📊 Videos encontrados: {len(info['entries'])}")
         
         # Descargar playlist
-        success = downloader.download_playlist(url, output_format, quality, output_path)
+        success = downloader.download_playlist(url, output_format, quality, output_path,
+                                               max_workers=concurrency,
+                                               write_metadata=keep_metadata)
     else:
         print(f"🎬 Video detectado: {info.get('title', 'Sin título')}")
         print(f"👤 Canal: {info.get('uploader', 'Desconocido')}")
         
         # Descargar video individual
-        success = downloader.download_single_video(url, output_format, quality, output_path)
+        success = downloader.download_single_video(url, output_format, quality, output_path,
+                                                   write_metadata=keep_metadata)
     
     if success:
         print("\n🎉 ¡Descarga completada exitosamente!")
@@ -151,6 +166,13 @@ def main():
                        help='Calidad de descarga (128, 192, 256, 320, 720p, 1080p, etc.) [default: 192]')
     parser.add_argument('--output', metavar='PATH', 
                        help='Carpeta de destino para las descargas [default: ./descargas]')
+    parser.add_argument('--concurrency', type=int, default=4, metavar='N',
+                       help='Descargas simultáneas al bajar playlists [default: 4]')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No reutilizar la información extraída de YouTube')
+    parser.add_argument('--no-metadata', action='store_true',
+                       help='No guardar .info.json ni incrustar la miniatura (más rápido; '
+                            'esos archivos no aparecen en el historial ni al organizar por fecha)')
     parser.add_argument('--version', action='version', version='YouTube Downloader 2.0.0')
     
     args = parser.parse_args()
@@ -163,7 +185,8 @@ def main():
         if args.cli:
             # Modo línea de comandos
             logger.info("Iniciando en modo línea de comandos")
-            success = run_cli_mode(args.cli, args.format, args.quality, args.output)
+            success = run_cli_mode(args.cli, args.format, args.quality, args.output,
+                                   args.concurrency, not args.no_cache, not args.no_metadata)
             sys.exit(0 if success else 1)
         else:
             # Modo interfaz gráfica
@@ -171,6 +194,11 @@ def main():
             print("🚀 Iniciando YouTube Downloader...")
             print("💡 Consejo: Usa --help para ver opciones de línea de comandos")
             
+            try:
+                from src.gui.main_window import YouTubeDownloaderGUI
+            except ImportError as e:
+                report_import_error(e)
+                
             app = YouTubeDownloaderGUI()
             app.run()
             
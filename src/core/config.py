@@ -44,8 +44,44 @@ DEFAULT_DOWNLOAD_CONFIG = {
     'noplaylist': False,
     'ignoreerrors': True,
     'overwrites': False,
+    'concurrent_fragment_downloads': 8,
+    # Descargar en bloques de 10 MB evita la limitación de velocidad de
+    # YouTube en conexiones largas; el timeout corta conexiones colgadas
+    'http_chunk_size': 10 * 1024 * 1024,
+    'socket_timeout': 10,
 }
 
+# Intervalo mínimo (segundos) entre actualizaciones de progreso
+PROGRESS_MIN_INTERVAL = 0.1
+
+# Consultas de metadatos simultáneas al resolver las entradas de una playlist
+METADATA_WORKERS = 16
+
+# Caché de información de videos: entradas máximas y vigencia en segundos
+# (las URLs de los formatos de YouTube caducan tras unas horas)
+INFO_CACHE_SIZE = 128
+INFO_CACHE_TTL = 1800
+
+# Playlists guardadas como máximo (cada una incluye los formatos de todas
+# sus entradas, por lo que ocupan mucho más que un video)
+INFO_CACHE_PLAYLISTS = 8
+
+# Manifiesto SQLite de descargas completadas (dentro de la carpeta base)
+MANIFEST_FILENAME = '.manifest.db'
+
+# Hilos para leer los archivos .info.json del historial
+HISTORY_READ_WORKERS = 8
+
+# URLs siguientes cuya información se consulta por adelantado en las
+# descargas por lotes (de una en una, en un único hilo)
+BATCH_PREFETCH_AHEAD = 2
+
+# Borrados simultáneos al limpiar temporales (unlink libera el GIL)
+CLEANUP_WORKERS = 16
+
+# Caché de análisis de calidad, indexada por ruta, mtime y tamaño
+QUALITY_CACHE_FILE = LOGS_DIR / 'quality_cache.json'
+
 # Formatos de audio soportados
 AUDIO_FORMATS = {
     'mp3': {'codec': 'mp3', 'quality': '192'},
@@ -55,6 +91,18 @@ AUDIO_FORMATS = {
     'ogg': {'codec': 'ogg', 'quality': '192'}
 }
 
+# Fuentes preferidas por formato de audio: si el stream original ya usa
+# el códec de salida, FFmpegExtractAudio lo copia sin recodificar.
+# 'ogg' no se incluye: yt-dlp solo copia cuando el códec pedido coincide
+# con el de la fuente, y 'ogg' nunca coincide con 'opus', así que preferir
+# fuentes Opus no evitaría la recodificación
+AUDIO_SOURCE_FORMATS = {
+    'm4a': 'bestaudio[ext=m4a]/bestaudio/best',
+}
+
+# Calidades que indican conservar el audio original
+LOSSLESS_QUALITIES = ('best', 'Mejor')
+
 # Formatos de video soportados
 VIDEO_FORMATS = {
     'mp4': 'best[ext=mp4]',
@@ -76,6 +124,37 @@ VIDEO_QUALITIES = {
     'Mejor': 'best'
 }
 
+# Plantillas de opciones de yt-dlp precalculadas por formato de salida.
+# Cada descarga trabaja sobre una copia profunda, nunca sobre la plantilla.
+AUDIO_OPTION_TEMPLATES = {
+    fmt: {
+        **DEFAULT_DOWNLOAD_CONFIG,
+        'format': AUDIO_SOURCE_FORMATS.get(fmt, 'bestaudio/best'),
+        'postprocessors': [
+            {
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': fmt,
+                'preferredquality': spec['quality'],
+            },
+            {'key': 'EmbedThumbnail'},
+            {'key': 'FFmpegMetadata'},
+        ],
+    }
+    for fmt, spec in AUDIO_FORMATS.items()
+}
+
+VIDEO_OPTION_TEMPLATES = {
+    fmt: {
+        **DEFAULT_DOWNLOAD_CONFIG,
+        'format': selector,
+        'postprocessors': [
+            {'key': 'EmbedThumbnail'},
+            {'key': 'FFmpegMetadata'},
+        ],
+    }
+    for fmt, selector in VIDEO_FORMATS.items()
+}
+
 # Configuración de la interfaz
 UI_CONFIG = {
     'window_size': (900, 700),
@@ -11,49 +11,134 @@ Fecha: 2025
 
 import yt_dlp
 import os
+import copy
+import re
 import json
+import sqlite3
+import heapq
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Callable, Union
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from operator import itemgetter
 import threading
 import time
 
-from .config import DEFAULT_DOWNLOAD_CONFIG, AUDIO_FORMATS, VIDEO_FORMATS, VIDEO_QUALITIES
+from .config import (
+    DEFAULT_DOWNLOAD_CONFIG, AUDIO_FORMATS, AUDIO_OPTION_TEMPLATES, LOSSLESS_QUALITIES,
+    HISTORY_READ_WORKERS, INFO_CACHE_PLAYLISTS, INFO_CACHE_SIZE, INFO_CACHE_TTL, MANIFEST_FILENAME,
+    METADATA_WORKERS, PROGRESS_MIN_INTERVAL, VIDEO_OPTION_TEMPLATES,
+    VIDEO_QUALITIES
+)
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa json de la librería estándar
+    orjson = None
+
+# yt-dlp escribe el campo 'id' al inicio de cada .info.json
+_INFO_ID_RE = re.compile(rb'"id"\s*:\s*"([^"]+)"')
+_INFO_ID_HEAD_SIZE = 4096
+
+# Campos de playlist que se conservan al descargar una entrada por URL
+_PLAYLIST_FIELDS = ('playlist', 'playlist_title', 'playlist_id', 'playlist_index')
+
+# Títulos que yt-dlp.utils.sanitize_filename devolvería sin cambios
+# (sin '_', que colapsa y recorta, y sin '-' o '.' al inicio)
+_SAFE_TITLE_RE = re.compile(r'[A-Za-z0-9()\[\]][A-Za-z0-9 ,.()\[\]-]{0,199}')
+
+
+def _parse_json_bytes(raw: bytes) -> Dict:
+    """Parsear JSON con orjson si está disponible"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _walk_info_jsons(root: str):
+    """
+    Recorrer un árbol de carpetas buscando archivos .info.json
+    
+    Usa os.scandir con una pila explícita: no crea objetos Path y
+    reutiliza los datos de stat que entrega el sistema operativo.
+    
+    Args:
+        root (str): Carpeta raíz
+        
+    Yields:
+        os.DirEntry: Entrada de cada archivo .info.json encontrado
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.info.json'):
+                        yield entry
+                except OSError:
+                    continue
 
 
 class ProgressHook:
-    """Hook para capturar el progreso de descarga"""
+    """
+    Hook para capturar el progreso de descarga
+    
+    Los datos de progreso se entregan como valores numéricos (bytes,
+    bytes/s, segundos) para que cada interfaz los formatee al mostrarlos.
+    Las actualizaciones de 'downloading' se limitan a una cada
+    PROGRESS_MIN_INTERVAL segundos.
+    """
     
     def __init__(self, callback: Optional[Callable] = None):
         self.callback = callback
         self.current_file = ""
         self.total_files = 0
         self.completed_files = 0
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
         
     def __call__(self, d):
         """Método llamado por yt-dlp para reportar progreso"""
         if d['status'] == 'downloading':
             if self.callback:
+                now = time.monotonic()
+                if now - self._last_emit < PROGRESS_MIN_INTERVAL:
+                    return
+                self._last_emit = now
+                
+                downloaded = d.get('downloaded_bytes') or 0
+                total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
                 progress_data = {
                     'status': 'downloading',
                     'filename': d.get('filename', ''),
-                    'percent': d.get('_percent_str', '0%'),
-                    'speed': d.get('_speed_str', ''),
-                    'eta': d.get('_eta_str', ''),
+                    'downloaded': downloaded,
+                    'total': total,
+                    'percent': downloaded * 100.0 / total if total else 0.0,
+                    'speed': d.get('speed') or 0.0,
+                    'eta': d.get('eta') or 0,
                     'total_files': self.total_files,
                     'completed_files': self.completed_files
                 }
                 self.callback(progress_data)
                 
         elif d['status'] == 'finished':
-            self.completed_files += 1
+            # Varios hilos pueden terminar archivos a la vez
+            with self._lock:
+                self.completed_files += 1
+                completed_files = self.completed_files
             if self.callback:
                 progress_data = {
                     'status': 'finished',
                     'filename': d.get('filename', ''),
                     'total_files': self.total_files,
-                    'completed_files': self.completed_files
+                    'completed_files': completed_files
                 }
                 self.callback(progress_data)
 
@@ -67,12 +152,13 @@ class YouTubeDownloader:
     descarga en paralelo, y diferentes formatos de salida.
     """
     
-    def __init__(self, base_path: str = "./descargas"):
+    def __init__(self, base_path: str = "./descargas", use_info_cache: bool = True):
         """
         Inicializar el descargador
         
         Args:
             base_path (str): Ruta base donde guardar las descargas
+            use_info_cache (bool): Reutilizar la información ya extraída por URL
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
@@ -80,6 +166,109 @@ class YouTubeDownloader:
         self.progress_hook = None
         self.is_downloading = False
         self.cancel_download = False
+        self.use_info_cache = use_info_cache
+        # Caché de información: url -> (momento de la extracción, info)
+        self._info_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+        # Caché de IDs descargados: carpeta -> (mtime, ids)
+        self._id_cache: Dict[Path, tuple] = {}
+        # Registro de descargas completadas (compartido por los hilos)
+        self._manifest_lock = threading.Lock()
+        self._manifest = self._open_manifest()
+        
+    def _open_manifest(self) -> Optional[sqlite3.Connection]:
+        """
+        Abrir (o crear) el manifiesto SQLite de descargas completadas
+        
+        Returns:
+            sqlite3.Connection: Conexión al manifiesto o None si no se pudo abrir
+        """
+        try:
+            conn = sqlite3.connect(
+                str(self.base_path / MANIFEST_FILENAME),
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS downloads (id TEXT PRIMARY KEY, path TEXT, ts REAL)'
+            )
+            return conn
+        except sqlite3.Error as e:
+            self.logger.warning(f"No se pudo abrir el manifiesto de descargas: {e}")
+            return None
+            
+    def _record_download(self, d: Dict):
+        """
+        Hook de post-procesado que registra cada archivo terminado en el manifiesto
+        
+        yt-dlp lo llama al terminar cada post-procesador; el último en
+        terminar deja registrada la ruta final del archivo.
+        
+        Args:
+            d (Dict): Datos del hook de yt-dlp
+        """
+        if d.get('status') != 'finished':
+            return
+            
+        info = d.get('info_dict') or {}
+        video_id = info.get('id')
+        filepath = info.get('filepath')
+        if not video_id or not filepath:
+            return
+            
+        try:
+            with self._manifest_lock:
+                self._manifest.execute(
+                    'INSERT OR REPLACE INTO downloads (id, path, ts) VALUES (?, ?, ?)',
+                    (video_id, os.path.abspath(filepath), time.time())
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"No se pudo registrar la descarga {video_id}: {e}")
+            
+    def _get_manifest_ids(self, folder_path: Path) -> set:
+        """
+        Obtener del manifiesto los IDs descargados dentro de una carpeta
+        
+        Las filas cuyo archivo ya no existe (borrado por el usuario) se
+        eliminan del manifiesto para que el video pueda descargarse de nuevo.
+        
+        Args:
+            folder_path (Path): Ruta de la carpeta a verificar
+            
+        Returns:
+            set: Conjunto de IDs registrados en la carpeta
+        """
+        if self._manifest is None:
+            return set()
+            
+        prefix = os.path.join(os.path.abspath(folder_path), '')
+        try:
+            with self._manifest_lock:
+                rows = self._manifest.execute(
+                    'SELECT id, path FROM downloads WHERE substr(path, 1, ?) = ?',
+                    (len(prefix), prefix)
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"No se pudo consultar el manifiesto: {e}")
+            return set()
+            
+        existing_ids = set()
+        stale_ids = []
+        for video_id, path in rows:
+            if os.path.exists(path):
+                existing_ids.add(video_id)
+            else:
+                stale_ids.append((video_id,))
+                
+        if stale_ids:
+            try:
+                with self._manifest_lock:
+                    self._manifest.executemany('DELETE FROM downloads WHERE id = ?', stale_ids)
+            except sqlite3.Error as e:
+                self.logger.warning(f"No se pudo limpiar el manifiesto: {e}")
+                
+        return existing_ids
         
     def set_progress_callback(self, callback: Callable):
         """
@@ -94,21 +283,124 @@ class YouTubeDownloader:
         """
         Obtener información de un video sin descargarlo
         
+        Las playlists se devuelven con sus entradas planas (id, url y
+        título); la información completa de cada entrada solo se obtiene
+        al descargar. Los resultados se guardan en caché hasta
+        INFO_CACHE_TTL segundos después de su extracción.
+        
         Args:
             url (str): URL del video o playlist
             
         Returns:
             Dict: Información del video/playlist o None si hay error
         """
+        if self.use_info_cache:
+            with self._info_cache_lock:
+                cached = self._info_cache.get(url)
+                if cached and time.time() - cached[0] <= INFO_CACHE_TTL:
+                    self._info_cache.move_to_end(url)
+                    return cached[1]
+                    
         try:
-            opts = {'quiet': True, 'no_warnings': True}
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return info
+            info = self._extract(url)
         except Exception as e:
             self.logger.error(f"Error obteniendo info: {e}")
             return None
             
+        if info and self.use_info_cache:
+            with self._info_cache_lock:
+                self._info_cache[url] = (time.time(), info)
+                self._info_cache.move_to_end(url)
+                self._trim_info_cache()
+        return info
+        
+    def _trim_info_cache(self):
+        """
+        Recortar la caché de información (se llama con el lock tomado)
+        
+        Descarta las entradas caducadas y, de las más antiguas a las más
+        recientes, lo que exceda INFO_CACHE_SIZE entradas o
+        INFO_CACHE_PLAYLISTS playlists.
+        """
+        now = time.time()
+        expired = [url for url, (fetched_at, _) in self._info_cache.items()
+                   if now - fetched_at > INFO_CACHE_TTL]
+        for url in expired:
+            del self._info_cache[url]
+            
+        while len(self._info_cache) > INFO_CACHE_SIZE:
+            self._info_cache.popitem(last=False)
+            
+        playlists = [url for url, (_, info) in self._info_cache.items() if 'entries' in info]
+        for url in playlists[:max(0, len(playlists) - INFO_CACHE_PLAYLISTS)]:
+            del self._info_cache[url]
+            
+    @staticmethod
+    def _extract(url: str) -> Optional[Dict]:
+        """
+        Extraer información con yt-dlp
+        
+        Args:
+            url (str): URL del video o playlist
+            
+        Returns:
+            Dict: Información del video/playlist
+        """
+        opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist'}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.extract_info(url, download=False)
+        
+    def clear_info_cache(self):
+        """Vaciar la caché de información de videos"""
+        with self._info_cache_lock:
+            self._info_cache.clear()
+        
+    @staticmethod
+    def _resolve_entries(playlist_info: Dict, entries: List[Dict]) -> List[Dict]:
+        """
+        Obtener la información completa de las entradas a descargar
+        
+        Cada consulta es una petición de red independiente, por lo que
+        se reparten en un pool de hilos con su propia instancia de YoutubeDL.
+        
+        Args:
+            playlist_info (Dict): Información plana de la playlist
+            entries (List[Dict]): Entradas planas, con su playlist_index
+            
+        Returns:
+            List[Dict]: Entradas resueltas; las que fallaron se devuelven planas
+            (con id y url) para que la descarga las vuelva a intentar
+        """
+        if not entries:
+            return []
+            
+        def resolve(entry):
+            entry_url = entry.get('url') or entry.get('webpage_url')
+            try:
+                opts = {'quiet': True, 'no_warnings': True}
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    entry_info = ydl.extract_info(entry_url, download=False)
+            except Exception as e:
+                logging.getLogger('youtube_downloader.downloader').error(
+                    f"Error obteniendo info de {entry_url}: {e}"
+                )
+                entry_info = None
+                
+            # Sin información completa se conserva la entrada plana: sin
+            # 'formats', _download_entry la descarga por URL
+            if not entry_info:
+                entry_info = dict(entry)
+                
+            # Mantener los campos de playlist que usa la plantilla de salida
+            entry_info.setdefault('playlist', playlist_info.get('title'))
+            entry_info.setdefault('playlist_title', playlist_info.get('title'))
+            entry_info.setdefault('playlist_id', playlist_info.get('id'))
+            entry_info.setdefault('playlist_index', entry.get('playlist_index'))
+            return entry_info
+            
+        with ThreadPoolExecutor(max_workers=min(METADATA_WORKERS, len(entries))) as executor:
+            return list(executor.map(resolve, entries))
+            
     def get_available_formats(self, url: str) -> Optional[List[Dict]]:
         """
         Obtener formatos disponibles para un video
@@ -128,34 +420,51 @@ class YouTubeDownloader:
         """
         Obtener IDs de videos ya descargados en una carpeta
         
+        Se unen los IDs del manifiesto con los de los archivos .info.json de
+        la carpeta, que cubren lo descargado antes de que existiera el
+        manifiesto o con los metadatos activados.
+        
         Args:
             folder_path (Path): Ruta de la carpeta a verificar
             
         Returns:
             set: Conjunto de IDs ya descargados
         """
-        downloaded_ids = set()
+        manifest_ids = self._get_manifest_ids(folder_path)
         
-        if not folder_path.exists():
-            return downloaded_ids
+        try:
+            mtime = folder_path.stat().st_mtime
+        except OSError:
+            return manifest_ids
+            
+        cached = self._id_cache.get(folder_path)
+        if cached and cached[0] == mtime:
+            return manifest_ids | cached[1]
             
+        downloaded_ids = set()
         for file in folder_path.glob("*.info.json"):
             try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    video_id = data.get('id')
+                with open(file, 'rb') as f:
+                    head = f.read(_INFO_ID_HEAD_SIZE)
+                    match = _INFO_ID_RE.search(head)
+                    if match:
+                        video_id = match.group(1).decode('utf-8')
+                    else:
+                        video_id = _parse_json_bytes(head + f.read()).get('id')
                     if video_id:
                         downloaded_ids.add(video_id)
-            except (json.JSONDecodeError, KeyError, FileNotFoundError):
+            except (ValueError, KeyError, OSError):
                 continue
                 
-        return downloaded_ids
+        self._id_cache[folder_path] = (mtime, frozenset(downloaded_ids))
+        return manifest_ids | downloaded_ids
         
     def _build_download_options(self, 
                               output_format: str = 'mp3',
                               quality: str = '192',
                               output_path: str = None,
-                              playlist_mode: bool = False) -> Dict:
+                              playlist_mode: bool = False,
+                              write_metadata: bool = True) -> Dict:
         """
         Construir opciones de descarga personalizadas
         
@@ -164,11 +473,18 @@ class YouTubeDownloader:
             quality (str): Calidad de descarga
             output_path (str): Ruta de salida personalizada
             playlist_mode (bool): Si es modo playlist
+            write_metadata (bool): Guardar .info.json y miniatura incrustada
             
         Returns:
             Dict: Opciones configuradas para yt-dlp
         """
-        options = DEFAULT_DOWNLOAD_CONFIG.copy()
+        template = (
+            AUDIO_OPTION_TEMPLATES.get(output_format)
+            or VIDEO_OPTION_TEMPLATES.get(output_format)
+            or DEFAULT_DOWNLOAD_CONFIG
+        )
+        # Copia profunda: las descargas en paralelo no comparten listas ni dicts
+        options = copy.deepcopy(template)
         
         # Configurar ruta de salida
         if output_path:
@@ -177,32 +493,38 @@ class YouTubeDownloader:
             else:
                 options['outtmpl'] = f'{output_path}/%(title)s.%(ext)s'
         
-        # Configurar formato de salida
+        # Configurar calidad de audio
         if output_format in AUDIO_FORMATS:
-            # Configuración para audio
-            options['format'] = 'bestaudio/best'
-            options['postprocessors'][0]['preferredcodec'] = output_format
-            options['postprocessors'][0]['preferredquality'] = quality
-        elif output_format in VIDEO_FORMATS:
-            # Configuración para video
-            options['format'] = VIDEO_FORMATS[output_format]
-            # Remover procesadores de audio para video
+            # En formatos sin pérdida no hay bitrate que fijar: sin calidad
+            # objetivo no se pasa -b:a/-q:a y ffmpeg usa los ajustes del códec
+            options['postprocessors'][0]['preferredquality'] = (
+                None if quality in LOSSLESS_QUALITIES else quality
+            )
+            
+        # Sin metadatos se evita descargar la miniatura y escribir el .info.json
+        if not write_metadata:
+            options['writethumbnail'] = False
+            options['writeinfojson'] = False
             options['postprocessors'] = [
-                {'key': 'EmbedThumbnail'},
-                {'key': 'FFmpegMetadata'}
+                pp for pp in options['postprocessors'] if pp['key'] != 'EmbedThumbnail'
             ]
             
         # Agregar hook de progreso si existe
         if self.progress_hook:
             options['progress_hooks'] = [self.progress_hook]
             
+        # Registrar en el manifiesto los archivos terminados
+        if self._manifest is not None:
+            options['postprocessor_hooks'] = [self._record_download]
+            
         return options
         
     def download_single_video(self, 
                             url: str,
                             output_format: str = 'mp3',
                             quality: str = '192',
-                            output_path: str = None) -> bool:
+                            output_path: str = None,
+                            write_metadata: bool = True) -> bool:
         """
         Descargar un video individual
         
@@ -211,6 +533,7 @@ class YouTubeDownloader:
             output_format (str): Formato de salida
             quality (str): Calidad de descarga
             output_path (str): Ruta de salida personalizada
+            write_metadata (bool): Guardar .info.json y miniatura incrustada
             
         Returns:
             bool: True si la descarga fue exitosa
@@ -220,11 +543,17 @@ class YouTubeDownloader:
             self.cancel_download = False
             
             options = self._build_download_options(
-                output_format, quality, output_path or str(self.base_path)
+                output_format, quality, output_path or str(self.base_path),
+                write_metadata=write_metadata
             )
             
             with yt_dlp.YoutubeDL(options) as ydl:
-                ydl.download([url])
+                # Con ignoreerrors los fallos se reportan en el código de retorno
+                retcode = ydl.download([url])
+                
+            if retcode:
+                self.logger.error(f"Error descargando video: {url}")
+                return False
                 
             self.logger.info(f"Descarga completada: {url}")
             return True
@@ -234,13 +563,16 @@ class YouTubeDownloader:
             return False
         finally:
             self.is_downloading = False
+            self._id_cache.clear()
             
     def download_playlist(self,
                          url: str,
                          output_format: str = 'mp3',
                          quality: str = '192',
                          output_path: str = None,
-                         skip_existing: bool = True) -> bool:
+                         skip_existing: bool = True,
+                         max_workers: int = 4,
+                         write_metadata: bool = True) -> bool:
         """
         Descargar una playlist completa
         
@@ -250,6 +582,8 @@ class YouTubeDownloader:
             quality (str): Calidad de descarga
             output_path (str): Ruta de salida personalizada
             skip_existing (bool): Saltar archivos ya descargados
+            max_workers (int): Número máximo de descargas simultáneas
+            write_metadata (bool): Guardar .info.json y miniatura incrustada
             
         Returns:
             bool: True si la descarga fue exitosa
@@ -264,60 +598,134 @@ class YouTubeDownloader:
                 return False
                 
             playlist_title = playlist_info.get('title', 'Playlist')
-            safe_title = yt_dlp.utils.sanitize_filename(playlist_title)
+            if _SAFE_TITLE_RE.fullmatch(playlist_title):
+                safe_title = playlist_title
+            else:
+                safe_title = yt_dlp.utils.sanitize_filename(playlist_title)
             
             # Configurar ruta de salida
             if not output_path:
                 output_path = str(self.base_path)
             playlist_folder = Path(output_path) / safe_title
             
+            # Copias de las entradas planas (que están en la caché) con su
+            # posición en la playlist, que usa la plantilla de salida
+            entries = [
+                dict(entry, playlist_index=entry.get('playlist_index') or index)
+                for index, entry in enumerate(playlist_info.get('entries') or (), 1)
+                if entry is not None
+            ]
+            
             # Actualizar hook de progreso
             if self.progress_hook:
-                entries = playlist_info.get('entries', [])
-                self.progress_hook.total_files = len([e for e in entries if e])
+                self.progress_hook.total_files = len(entries)
                 self.progress_hook.completed_files = 0
             
             # Verificar archivos existentes si está habilitado
-            urls_to_download = []
-            downloaded_ids = set()
-            
             if skip_existing:
-                downloaded_ids = self._get_downloaded_ids(playlist_folder)
+                downloaded_ids = frozenset(self._get_downloaded_ids(playlist_folder))
+                entries_to_download = [e for e in entries if e.get('id') not in downloaded_ids]
+                skipped = len(entries) - len(entries_to_download)
+                if skipped:
+                    self.logger.info(f"Saltando {skipped} archivos existentes")
+            else:
+                entries_to_download = entries
                 
-            for entry in playlist_info.get('entries', []):
-                if entry is None:
-                    continue
-                    
-                video_id = entry.get('id')
-                if not skip_existing or video_id not in downloaded_ids:
-                    urls_to_download.append(f"https://www.youtube.com/watch?v={video_id}")
-                else:
-                    self.logger.info(f"Saltando archivo existente: {entry.get('title', video_id)}")
-                    
-            if not urls_to_download:
+            if not entries_to_download:
                 self.logger.info("No hay archivos nuevos para descargar")
                 return True
                 
+            # Información completa solo de las entradas que se van a descargar
+            entries_to_download = self._resolve_entries(playlist_info, entries_to_download)
+            
             # Configurar opciones de descarga
             options = self._build_download_options(
-                output_format, quality, output_path, playlist_mode=True
+                output_format, quality, output_path, playlist_mode=True,
+                write_metadata=write_metadata
             )
+            # Sin manifiesto, la detección de duplicados depende de los .info.json
+            if skip_existing and self._manifest is None:
+                options['writeinfojson'] = True
+                
+            # Repartir las conexiones de fragmentos entre los hilos para que el
+            # total de conexiones simultáneas no crezca con max_workers
+            max_workers = max(1, max_workers)
+            fragments = options.get('concurrent_fragment_downloads')
+            if fragments:
+                options['concurrent_fragment_downloads'] = max(1, fragments // max_workers)
             
-            # Descargar archivos
-            with yt_dlp.YoutubeDL(options) as ydl:
-                for url_to_download in urls_to_download:
+            # Descargar archivos en paralelo. Cada entrada descarga y post-procesa
+            # en su propio hilo, así que el ffmpeg de una entrada se solapa con
+            # la descarga de red de las siguientes
+            failed = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._download_entry, entry, options)
+                    for entry in entries_to_download
+                ]
+                for future in as_completed(futures):
                     if self.cancel_download:
+                        for pending in futures:
+                            pending.cancel()
                         break
-                    ydl.download([url_to_download])
-                    
-            self.logger.info(f"Descarga de playlist completada: {len(urls_to_download)} archivos")
-            return not self.cancel_download
+                    if not future.result():
+                        failed += 1
+                        
+            if failed:
+                self.logger.warning(f"{failed} de {len(entries_to_download)} archivos no se pudieron descargar")
+            self.logger.info(f"Descarga de playlist completada: {len(entries_to_download) - failed} archivos")
+            return not self.cancel_download and failed == 0
             
         except Exception as e:
             self.logger.error(f"Error descargando playlist: {e}")
             return False
         finally:
             self.is_downloading = False
+            self._id_cache.clear()
+            
+    def _download_entry(self, entry: Dict, options: Dict) -> bool:
+        """
+        Descargar una entrada de playlist con su propia instancia de YoutubeDL
+        
+        YoutubeDL no es thread-safe, por lo que cada hilo del pool
+        crea su instancia en lugar de compartir una. Si la entrada ya
+        trae sus formatos (obtenidos por _resolve_entries) se procesa
+        directamente, sin volver a consultar el extractor.
+        
+        Con ignoreerrors yt-dlp registra los errores sin lanzar excepciones,
+        así que el éxito se comprueba en el resultado: cada descarga
+        solicitada debe haber dejado su archivo en disco.
+        
+        Args:
+            entry (Dict): Información de la entrada de la playlist
+            options (Dict): Opciones de yt-dlp
+            
+        Returns:
+            bool: True si la descarga fue exitosa
+        """
+        if self.cancel_download:
+            return False
+            
+        url = (entry.get('webpage_url') or entry.get('url')
+               or f"https://www.youtube.com/watch?v={entry.get('id')}")
+        try:
+            with yt_dlp.YoutubeDL(options) as ydl:
+                if entry.get('formats'):
+                    # La entrada resuelta no está en la caché: yt-dlp puede modificarla
+                    result = ydl.process_ie_result(entry, download=True)
+                else:
+                    # Conservar los campos de playlist que usa la plantilla de salida
+                    extra_info = {key: entry[key] for key in _PLAYLIST_FIELDS if key in entry}
+                    result = ydl.extract_info(url, download=True, extra_info=extra_info)
+        except Exception as e:
+            self.logger.error(f"Error descargando {url}: {e}")
+            return False
+            
+        downloads = (result or {}).get('requested_downloads')
+        if not downloads or not all(os.path.exists(d.get('filepath') or '') for d in downloads):
+            self.logger.error(f"Error descargando {url}")
+            return False
+        return True
             
     def cancel_current_download(self):
         """Cancelar la descarga actual"""
@@ -348,31 +756,54 @@ class YouTubeDownloader:
             self.logger.error(f"Error en búsqueda: {e}")
             return []
             
-    def get_download_history(self) -> List[Dict]:
+    def get_download_history(self, max_items: Optional[int] = 100) -> List[Dict]:
         """
         Obtener historial de descargas
         
+        Args:
+            max_items (int): Número máximo de entradas (None para todas)
+            
         Returns:
-            List[Dict]: Lista de archivos descargados con metadata
+            List[Dict]: Archivos descargados con metadata, los más recientes
+            primero. 'download_date' es un timestamp (segundos desde epoch).
         """
-        history = []
+        info_files = list(_walk_info_jsons(str(self.base_path)))
+        if not info_files:
+            return []
+            
+        # La lectura de cada archivo es I/O puro, se solapa en varios hilos
+        with ThreadPoolExecutor(max_workers=min(HISTORY_READ_WORKERS, len(info_files))) as executor:
+            history = [entry for entry in executor.map(self._read_history_entry, info_files) if entry]
+            
+        by_date = itemgetter('download_date')
+        if max_items is None:
+            return sorted(history, key=by_date, reverse=True)
+        return heapq.nlargest(max_items, history, key=by_date)
         
-        for info_file in self.base_path.rglob("*.info.json"):
-            try:
-                with open(info_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                history.append({
-                    'title': data.get('title', ''),
-                    'uploader': data.get('uploader', ''),
-                    'duration': data.get('duration', 0),
-                    'upload_date': data.get('upload_date', ''),
-                    'url': data.get('webpage_url', ''),
-                    'file_path': str(info_file.parent),
-                    'download_date': time.ctime(info_file.stat().st_mtime)
-                })
-                
-            except (json.JSONDecodeError, KeyError, FileNotFoundError):
-                continue
+    @staticmethod
+    def _read_history_entry(info_file: os.DirEntry) -> Optional[Dict]:
+        """
+        Leer una entrada del historial desde su archivo .info.json
+        
+        Args:
+            info_file (os.DirEntry): Entrada del archivo .info.json
+            
+        Returns:
+            Dict: Entrada del historial o None si el archivo no es válido
+        """
+        try:
+            with open(info_file.path, 'rb') as f:
+                data = _parse_json_bytes(f.read())
                 
-        return sorted(history, key=lambda x: x.get('download_date', ''), reverse=True)
\ No newline at end of file
+            return {
+                'title': data.get('title', ''),
+                'uploader': data.get('uploader', ''),
+                'duration': data.get('duration', 0),
+                'upload_date': data.get('upload_date', ''),
+                'url': data.get('webpage_url', ''),
+                'file_path': os.path.dirname(info_file.path),
+                'download_date': info_file.stat().st_mtime
+            }
+            
+        except (ValueError, KeyError, OSError):
+            return None
@@ -10,16 +10,518 @@ Fecha: 2025
 """
 
 import os
+import errno
 import json
 import shutil
 from pathlib import Path
 from typing import List, Dict, Optional
 import threading
 import time
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 
-from .config import DOWNLOADS_DIR, LOGS_DIR
-from .downloader import YouTubeDownloader
-from ..utils.helpers import format_file_size, get_folder_size
+try:
+    from mutagen import File as _mutagen_File
+except ImportError:  # mutagen es opcional, solo se usa como respaldo
+    _mutagen_File = None
+
+try:
+    import ijson
+except ImportError:  # ijson es opcional, solo para info.json muy grandes
+    ijson = None
+
+from .config import (DOWNLOADS_DIR, LOGS_DIR, QUALITY_CACHE_FILE, BATCH_PREFETCH_AHEAD,
+                     CLEANUP_WORKERS)
+from .downloader import YouTubeDownloader, _parse_json_bytes
+from ..utils.helpers import format_file_size, load_json_file, save_json_file
+
+# Extensiones de archivos temporales que deja yt-dlp
+TEMP_SUFFIXES = ('.part', '.tmp', '.temp', '.ytdl')
+
+# Tamaño a partir del cual un info.json se lee en streaming (si hay ijson);
+# los de playlists con todas sus entradas pueden ocupar decenas de MB
+_STREAM_JSON_MIN_SIZE = 4 * 1024 * 1024
+
+# Extensiones de audio incluidas en el reporte de calidad
+AUDIO_SUFFIXES = ('.mp3', '.flac', '.wav', '.m4a', '.ogg')
+
+
+def _iter_tree(root: str):
+    """
+    Recorrer un árbol de carpetas con os.scandir
+    
+    Usa una pila explícita en lugar de recursión y no crea objetos Path;
+    las entradas con errores de permisos se omiten.
+    
+    Args:
+        root (str): Carpeta raíz
+        
+    Yields:
+        os.DirEntry: Cada archivo y carpeta bajo la raíz
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                except OSError:
+                    continue
+                yield entry
+
+
+def _try_unlink(path: str) -> bool:
+    """Eliminar un archivo; devuelve False si no se pudo"""
+    try:
+        os.unlink(path)
+        return True
+    except OSError:
+        return False
+
+
+def _read_upload_date(path: str) -> str:
+    """
+    Leer el campo upload_date de un archivo .info.json
+    
+    Los archivos grandes se recorren en streaming con ijson y la lectura se
+    detiene al encontrar el campo, sin construir todo el documento.
+    
+    Args:
+        path (str): Ruta del info.json
+        
+    Returns:
+        str: Fecha en formato YYYYMMDD o cadena vacía
+    """
+    with open(path, 'rb') as f:
+        if ijson is not None and os.fstat(f.fileno()).st_size >= _STREAM_JSON_MIN_SIZE:
+            try:
+                for prefix, event, value in ijson.parse(f):
+                    if prefix == 'upload_date' and event == 'string':
+                        return value
+            except ijson.JSONError:
+                pass
+            return ''
+            
+        raw = f.read()
+        
+    # Búsqueda de bytes antes de parsear: sin fecha no hay nada que mover
+    if b'"upload_date"' not in raw:
+        return ''
+    return _parse_json_bytes(raw).get('upload_date') or ''
+
+
+def _move_file(src: str, dst: str):
+    """
+    Mover un archivo, con os.rename como vía rápida
+    
+    Dentro del mismo sistema de archivos el renombrado es atómico; entre
+    dispositivos distintos se copia con shutil.copyfile (que usa sendfile
+    o fcopyfile del kernel, sin copiar permisos ni fechas) y se borra el
+    original.
+    
+    Args:
+        src (str): Ruta de origen
+        dst (str): Ruta de destino
+    """
+    try:
+        os.rename(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+            
+    try:
+        shutil.copyfile(src, dst)
+    except OSError:
+        # No dejar una copia a medias en el destino
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        raise
+    os.unlink(src)
+
+
+# Entrada de un recorrido del árbol: size y mtime_ns valen 0 en carpetas
+_FileRecord = namedtuple('_FileRecord', 'path name size mtime_ns is_dir suffix')
+
+
+def _scan(root: str) -> List[_FileRecord]:
+    """
+    Recorrer el árbol una sola vez y guardar los datos de cada entrada
+    
+    Permite que varios pasos de mantenimiento compartan un único recorrido.
+    Los enlaces simbólicos y entradas especiales se omiten.
+    
+    Args:
+        root (str): Carpeta raíz
+        
+    Returns:
+        List[_FileRecord]: Archivos y carpetas bajo la raíz
+    """
+    records = []
+    for entry in _iter_tree(root):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                records.append(_FileRecord(entry.path, entry.name, 0, 0, True, ''))
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                records.append(_FileRecord(entry.path, entry.name, st.st_size, st.st_mtime_ns,
+                                           False, os.path.splitext(entry.name)[1].lower()))
+        except OSError:
+            continue
+    return records
+
+
+def _record_stats(records: List[_FileRecord]) -> Dict:
+    """
+    Calcular tamaño, número de archivos/carpetas y extensiones
+    
+    Args:
+        records (List[_FileRecord]): Resultado de _scan
+        
+    Returns:
+        Dict: total_size, file_count, folder_count y extensions
+    """
+    files = [record for record in records if not record.is_dir]
+    
+    return {
+        'total_size': sum(record.size for record in files),
+        'file_count': len(files),
+        'folder_count': len(records) - len(files),
+        'extensions': dict(Counter(record.suffix for record in files))
+    }
+
+
+# Tablas de cabeceras MPEG de audio. Bitrates en kbps indexados por
+# [MPEG-1 / MPEG-2 y 2.5][capa I, II, III][índice de bitrate]
+_MPEG_BITRATES = (
+    (
+        (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ),
+    (
+        (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ),
+)
+
+# Frecuencias de muestreo indexadas por los bits de versión (2.5, reservado, 2, 1)
+_MPEG_SAMPLE_RATES = (
+    (11025, 12000, 8000),
+    None,
+    (22050, 24000, 16000),
+    (44100, 48000, 32000),
+)
+
+# Bytes leídos tras la etiqueta ID3v2 para encontrar la primera trama MPEG
+_MP3_SCAN_SIZE = 8192
+
+# Átomos MP4 que contienen otros átomos en el camino hasta 'mp4a'
+_MP4_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+
+def _decode_mpeg_frame(header: bytes) -> Optional[tuple]:
+    """
+    Decodificar una cabecera de trama MPEG de audio (4 bytes)
+    
+    Args:
+        header (bytes): Cabecera de la trama
+        
+    Returns:
+        tuple: (bitrate kbps, sample rate, canales, muestras por trama,
+        desplazamiento de la etiqueta Xing, longitud de la trama en bytes)
+        o None si no es una cabecera válida
+    """
+    if header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+        
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 3
+    if version == 1 or layer == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+        
+    mpeg1 = version == 3
+    layer_index = 3 - layer  # 0: capa I, 1: capa II, 2: capa III
+    bitrate = _MPEG_BITRATES[0 if mpeg1 else 1][layer_index][bitrate_index]
+    sample_rate = _MPEG_SAMPLE_RATES[version][sample_rate_index]
+    mono = (header[3] >> 6) == 3
+    padding = (header[2] >> 1) & 1
+    
+    if layer_index == 0:
+        samples_per_frame = 384
+    elif layer_index == 1 or mpeg1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+        
+    # La capa I cuenta en palabras de 4 bytes; las capas II y III en bytes
+    if layer_index == 0:
+        frame_length = (12000 * bitrate // sample_rate + padding) * 4
+    else:
+        frame_length = samples_per_frame // 8 * 1000 * bitrate // sample_rate + padding
+        
+    # La etiqueta Xing/Info va después de la información lateral de la trama
+    if mpeg1:
+        xing_offset = 4 + (17 if mono else 32)
+    else:
+        xing_offset = 4 + (9 if mono else 17)
+        
+    return bitrate, sample_rate, 1 if mono else 2, samples_per_frame, xing_offset, frame_length
+
+
+def _mpeg_frame_follows(f, buf: bytes, audio_start: int, pos: int, frame_length: int) -> bool:
+    """
+    Comprobar que una trama candidata va seguida de otra compatible
+    
+    Una secuencia 0xFFEx suelta (en la carátula o el relleno) puede parecer
+    una cabecera válida; la siguiente trama debe empezar justo donde
+    termina la candidata, con la misma versión, capa y frecuencia.
+    
+    Args:
+        f: Archivo abierto en modo binario
+        buf (bytes): Bytes leídos desde audio_start
+        audio_start (int): Posición de buf en el archivo
+        pos (int): Posición de la trama candidata en buf
+        frame_length (int): Longitud de la trama candidata
+        
+    Returns:
+        bool: True si la siguiente cabecera es compatible o el archivo
+        termina justo al final de la candidata
+    """
+    next_pos = pos + frame_length
+    header = buf[next_pos:next_pos + 4]
+    if len(header) < 4:
+        f.seek(audio_start + next_pos)
+        header = f.read(4)
+        if not header:
+            return True
+            
+    return (_decode_mpeg_frame(header) is not None
+            and (header[1] ^ buf[pos + 1]) & 0xFE == 0
+            and (header[2] ^ buf[pos + 2]) & 0x0C == 0)
+
+
+def _parse_mp3_header(f) -> Optional[Dict]:
+    """
+    Leer duración y calidad de un MP3 desde su primera trama
+    
+    Args:
+        f: Archivo abierto en modo binario
+        
+    Returns:
+        Dict: duration, bitrate, sample_rate y channels, o None si no se reconoce
+    """
+    file_size = os.fstat(f.fileno()).st_size
+    head = f.read(10)
+    
+    # Saltar la etiqueta ID3v2 (tamaño en entero synchsafe de 28 bits)
+    audio_start = 0
+    if len(head) == 10 and head[:3] == b'ID3':
+        size = head[6:10]
+        audio_start = 10 + (((size[0] & 0x7F) << 21) | ((size[1] & 0x7F) << 14)
+                            | ((size[2] & 0x7F) << 7) | (size[3] & 0x7F))
+        if head[5] & 0x10:  # Pie de etiqueta
+            audio_start += 10
+            
+    f.seek(audio_start)
+    buf = f.read(_MP3_SCAN_SIZE)
+    
+    pos = buf.find(b'\xff')
+    while 0 <= pos <= len(buf) - 4:
+        frame = _decode_mpeg_frame(buf[pos:pos + 4])
+        if frame and _mpeg_frame_follows(f, buf, audio_start, pos, frame[5]):
+            break
+        pos = buf.find(b'\xff', pos + 1)
+    else:
+        return None
+        
+    bitrate, sample_rate, channels, samples_per_frame, xing_offset, _ = frame
+    audio_size = file_size - audio_start - pos
+    
+    # Archivos VBR: el número de tramas está en la etiqueta Xing/Info
+    xing = pos + xing_offset
+    if buf[xing:xing + 4] in (b'Xing', b'Info') and len(buf) >= xing + 12:
+        flags = int.from_bytes(buf[xing + 4:xing + 8], 'big')
+        frames = int.from_bytes(buf[xing + 8:xing + 12], 'big')
+        if flags & 1 and frames:
+            duration = frames * samples_per_frame / sample_rate
+            return {
+                'duration': duration,
+                'bitrate': int(audio_size * 8 / duration),
+                'sample_rate': sample_rate,
+                'channels': channels
+            }
+            
+    return {
+        'duration': audio_size * 8 / (bitrate * 1000),
+        'bitrate': bitrate * 1000,
+        'sample_rate': sample_rate,
+        'channels': channels
+    }
+
+
+def _parse_flac_header(f) -> Optional[Dict]:
+    """
+    Leer duración y calidad de un FLAC desde su bloque STREAMINFO
+    
+    Args:
+        f: Archivo abierto en modo binario
+        
+    Returns:
+        Dict: duration, bitrate, sample_rate y channels, o None si no se reconoce
+    """
+    file_size = os.fstat(f.fileno()).st_size
+    head = f.read(42)
+    if len(head) < 42 or head[:4] != b'fLaC' or (head[4] & 0x7F) != 0:
+        return None
+        
+    # 20 bits de sample rate, 3 de canales, 5 de bits por muestra y 36 de muestras
+    fields = int.from_bytes(head[18:26], 'big')
+    sample_rate = fields >> 44
+    channels = ((fields >> 41) & 0x7) + 1
+    total_samples = fields & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+        
+    # Saltar el resto de bloques de metadatos para medir solo el audio
+    offset = 42
+    last_block = head[4] & 0x80
+    while not last_block:
+        f.seek(offset)
+        block_header = f.read(4)
+        if len(block_header) < 4:
+            return None
+        last_block = block_header[0] & 0x80
+        offset += 4 + int.from_bytes(block_header[1:4], 'big')
+        
+    duration = total_samples / sample_rate
+    return {
+        'duration': duration,
+        'bitrate': int(max(file_size - offset, 0) * 8 / duration),
+        'sample_rate': sample_rate,
+        'channels': channels
+    }
+
+
+def _iter_mp4_atoms(data: bytes, start: int, end: int):
+    """
+    Recorrer los átomos MP4 de un bloque en memoria
+    
+    Desciende en los contenedores que llevan a la descripción de audio.
+    
+    Yields:
+        tuple: (tipo, inicio del contenido, fin del átomo)
+    """
+    pos = start
+    while pos + 8 <= end:
+        size = int.from_bytes(data[pos:pos + 4], 'big')
+        kind = data[pos + 4:pos + 8]
+        header_size = 8
+        if size == 1:
+            size = int.from_bytes(data[pos + 8:pos + 16], 'big')
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size or pos + size > end:
+            return
+            
+        yield kind, pos + header_size, pos + size
+        if kind in _MP4_CONTAINERS:
+            yield from _iter_mp4_atoms(data, pos + header_size, pos + size)
+        elif kind == b'stsd':
+            # versión/flags y número de entradas antes de las descripciones
+            yield from _iter_mp4_atoms(data, pos + header_size + 8, pos + size)
+        pos += size
+
+
+def _parse_m4a_header(f) -> Optional[Dict]:
+    """
+    Leer duración y calidad de un M4A desde sus átomos 'mvhd' y 'mp4a'
+    
+    Solo se lee el átomo 'moov'; los datos de audio ('mdat') se saltan.
+    
+    Args:
+        f: Archivo abierto en modo binario
+        
+    Returns:
+        Dict: duration, bitrate, sample_rate y channels, o None si no se reconoce
+    """
+    file_size = os.fstat(f.fileno()).st_size
+    moov = None
+    audio_size = 0
+    
+    # Átomos de primer nivel: solo se leen sus cabeceras
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        if len(header) < 8:
+            break
+        size = int.from_bytes(header[:4], 'big')
+        kind = header[4:8]
+        header_size = 8
+        if size == 1 and len(header) == 16:
+            size = int.from_bytes(header[8:16], 'big')
+            header_size = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < header_size:
+            return None
+            
+        if kind == b'moov':
+            moov = (pos + header_size, pos + size)
+        elif kind == b'mdat':
+            audio_size += size - header_size
+        pos += size
+        
+    if moov is None:
+        return None
+        
+    f.seek(moov[0])
+    data = f.read(moov[1] - moov[0])
+    
+    timescale = units = 0
+    sample_rate = channels = 0
+    for kind, start, end in _iter_mp4_atoms(data, 0, len(data)):
+        if kind == b'mvhd' and not timescale:
+            if data[start] == 1:
+                timescale = int.from_bytes(data[start + 20:start + 24], 'big')
+                units = int.from_bytes(data[start + 24:start + 32], 'big')
+            else:
+                timescale = int.from_bytes(data[start + 12:start + 16], 'big')
+                units = int.from_bytes(data[start + 16:start + 20], 'big')
+        elif kind == b'mp4a' and not sample_rate and end - start >= 28:
+            channels = int.from_bytes(data[start + 16:start + 18], 'big')
+            sample_rate = int.from_bytes(data[start + 24:start + 26], 'big')
+            
+    if not timescale or not units or not sample_rate:
+        return None
+        
+    duration = units / timescale
+    return {
+        'duration': duration,
+        'bitrate': int(audio_size * 8 / duration),
+        'sample_rate': sample_rate,
+        'channels': channels
+    }
+
+
+# Lectores de cabecera por extensión; el resto de formatos usa mutagen
+_HEADER_PARSERS = {
+    '.mp3': _parse_mp3_header,
+    '.flac': _parse_flac_header,
+    '.m4a': _parse_m4a_header,
+}
 
 
 class SearchManager:
@@ -61,73 +563,92 @@ class FileManager:
     def __init__(self, base_path: Path = DOWNLOADS_DIR):
         self.base_path = Path(base_path)
         
-    def get_storage_info(self) -> Dict:
+    def get_storage_info(self, records: Optional[List[_FileRecord]] = None) -> Dict:
         """
         Obtener información de almacenamiento
         
+        Args:
+            records (List[_FileRecord]): Recorrido ya hecho con _scan (opcional)
+            
         Returns:
             Dict: Información de espacio usado
         """
-        total_size = get_folder_size(self.base_path)
-        file_count = len(list(self.base_path.rglob('*')))
-        
-        # Contar por tipo de archivo
-        extensions = {}
-        for file_path in self.base_path.rglob('*'):
-            if file_path.is_file():
-                ext = file_path.suffix.lower()
-                extensions[ext] = extensions.get(ext, 0) + 1
-                
+        if records is None:
+            records = _scan(str(self.base_path))
+        stats = _record_stats(records)
+        
         return {
-            'total_size': total_size,
-            'total_size_formatted': format_file_size(total_size),
-            'file_count': file_count,
-            'extensions': extensions,
-            'folder_count': len([p for p in self.base_path.rglob('*') if p.is_dir()])
+            'total_size': stats['total_size'],
+            'total_size_formatted': format_file_size(stats['total_size']),
+            'file_count': stats['file_count'],
+            'extensions': stats['extensions'],
+            'folder_count': stats['folder_count']
         }
         
-    def clean_temp_files(self) -> int:
+    def clean_temp_files(self, records: Optional[List[_FileRecord]] = None) -> int:
         """
         Limpiar archivos temporales
         
+        Args:
+            records (List[_FileRecord]): Recorrido ya hecho con _scan (opcional);
+                los archivos eliminados se quitan de la lista
+                
         Returns:
             int: Número de archivos eliminados
         """
-        temp_extensions = ['.part', '.tmp', '.temp', '.ytdl']
-        deleted_count = 0
-        
-        for ext in temp_extensions:
-            for file_path in self.base_path.rglob(f'*{ext}'):
-                try:
-                    file_path.unlink()
-                    deleted_count += 1
-                except (OSError, PermissionError):
-                    continue
-                    
-        return deleted_count
+        if records is None:
+            records = _scan(str(self.base_path))
+        candidates = [record.path for record in records
+                      if not record.is_dir and record.name.endswith(TEMP_SUFFIXES)]
+        if not candidates:
+            return 0
+            
+        # Cada borrado es una ida y vuelta de metadatos (lenta en discos de red):
+        # se lanzan en paralelo
+        with ThreadPoolExecutor(max_workers=min(CLEANUP_WORKERS, len(candidates))) as executor:
+            deleted = {path for path, ok in zip(candidates, executor.map(_try_unlink, candidates)) if ok}
+            
+        if deleted:
+            records[:] = [r for r in records if r.path not in deleted]
+        return len(deleted)
         
-    def clean_empty_folders(self) -> int:
+    def clean_empty_folders(self, records: Optional[List[_FileRecord]] = None) -> int:
         """
         Eliminar carpetas vacías
         
+        Args:
+            records (List[_FileRecord]): Recorrido ya hecho con _scan (opcional);
+                las carpetas eliminadas se quitan de la lista
+                
         Returns:
             int: Número de carpetas eliminadas
         """
-        deleted_count = 0
-        
-        # Ordenar por profundidad descendente para eliminar desde las más profundas
-        folders = sorted(self.base_path.rglob('*'), key=lambda p: len(p.parts), reverse=True)
-        
+        if records is None:
+            records = _scan(str(self.base_path))
+            
+        # Número de hijos de cada carpeta según el recorrido
+        children = defaultdict(int)
+        for record in records:
+            children[os.path.dirname(record.path)] += 1
+            
+        # Las carpetas más profundas primero: al eliminar una, su padre
+        # tiene un hijo menos y puede quedar vacío a su vez
+        folders = sorted((r.path for r in records if r.is_dir),
+                         key=lambda path: path.count(os.sep), reverse=True)
+        removed = set()
         for folder in folders:
-            if folder.is_dir() and folder != self.base_path:
-                try:
-                    if not any(folder.iterdir()):  # Carpeta vacía
-                        folder.rmdir()
-                        deleted_count += 1
-                except (OSError, PermissionError):
-                    continue
-                    
-        return deleted_count
+            if children[folder]:
+                continue
+            try:
+                os.rmdir(folder)
+            except OSError:
+                continue
+            removed.add(folder)
+            children[os.path.dirname(folder)] -= 1
+            
+        if removed:
+            records[:] = [r for r in records if r.path not in removed]
+        return len(removed)
         
     def organize_by_date(self) -> int:
         """
@@ -137,34 +658,43 @@ class FileManager:
             int: Número de archivos organizados
         """
         organized_count = 0
+        info_suffix = '.info.json'
         
-        for file_path in self.base_path.rglob('*.info.json'):
+        # Un solo recorrido: nombres de archivo agrupados por carpeta, así los
+        # archivos relacionados y los destinos se consultan sin más syscalls
+        siblings = defaultdict(set)
+        info_files = []
+        for entry in _iter_tree(str(self.base_path)):
+            parent = os.path.dirname(entry.path)
+            siblings[parent].add(entry.name)
+            if entry.name.endswith(info_suffix):
+                info_files.append((parent, entry.name))
+                
+        for parent, info_name in info_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                upload_date = data.get('upload_date', '')
-                if upload_date and len(upload_date) >= 8:
-                    year = upload_date[:4]
-                    month = upload_date[4:6]
-                    
-                    # Crear estructura de carpetas por año/mes
-                    date_folder = self.base_path / year / month
-                    date_folder.mkdir(parents=True, exist_ok=True)
+                upload_date = _read_upload_date(os.path.join(parent, info_name))
+                if not upload_date or len(upload_date) < 8:
+                    continue
                     
-                    # Mover archivos relacionados
-                    file_base = file_path.stem
-                    for related_file in file_path.parent.glob(f'{file_base}.*'):
-                        if related_file.suffix != '.info.json':
-                            new_path = date_folder / related_file.name
-                            if not new_path.exists():
-                                shutil.move(str(related_file), str(new_path))
-                                organized_count += 1
-                                
-                    # Mover el archivo info.json
-                    new_info_path = date_folder / file_path.name
-                    if not new_info_path.exists():
-                        shutil.move(str(file_path), str(new_info_path))
+                # Crear estructura de carpetas por año/mes
+                date_folder = os.path.join(str(self.base_path), upload_date[:4], upload_date[4:6])
+                if date_folder == parent:
+                    continue
+                os.makedirs(date_folder, exist_ok=True)
+                existing = siblings[date_folder]
+                
+                # Mover archivos relacionados (mismo nombre base) y al final el info.json
+                prefix = info_name[:-len(info_suffix)] + '.'
+                related = [name for name in siblings[parent]
+                           if name.startswith(prefix) and name != info_name]
+                for name in related + [info_name]:
+                    if name in existing:
+                        continue
+                    _move_file(os.path.join(parent, name), os.path.join(date_folder, name))
+                    siblings[parent].discard(name)
+                    existing.add(name)
+                    if name != info_name:
+                        organized_count += 1
                         
             except (json.JSONDecodeError, KeyError, OSError):
                 continue
@@ -181,6 +711,8 @@ class BatchDownloader:
         self.current_index = 0
         self.total_urls = 0
         self.results = []
+        self._cancel = threading.Event()
+        self._info_futures = {}
         
     def download_from_list(self, urls: List[str], 
                           output_format: str = 'mp3',
@@ -200,13 +732,51 @@ class BatchDownloader:
         Returns:
             List[Dict]: Resultados de cada descarga
         """
+        self._cancel.clear()
         self.is_running = True
         self.total_urls = len(urls)
         self.current_index = 0
         self.results = []
         
+        # Adelantar la obtención de información: mientras se descarga una URL
+        # se consultan las siguientes. Un único hilo y una ventana corta
+        # limitan las consultas simultáneas a YouTube
+        info_executor = ThreadPoolExecutor(max_workers=1)
+        info_futures = {}
+        self._info_futures = info_futures
+        
+        try:
+            self._process_list(urls, info_executor, info_futures, output_format,
+                               quality, output_path, progress_callback)
+        finally:
+            for future in list(info_futures.values()):
+                future.cancel()
+            info_executor.shutdown(wait=False)
+            self._info_futures = {}
+            
+        self.is_running = False
+        return self.results
+        
+    def _process_list(self, urls: List[str], info_executor: ThreadPoolExecutor,
+                      info_futures: Dict, output_format: str, quality: str,
+                      output_path: str, progress_callback: Optional[callable]):
+        """
+        Descargar las URLs en orden usando la información ya solicitada
+        
+        Antes de cada URL se solicita la información de las
+        BATCH_PREFETCH_AHEAD siguientes, si aún no se había pedido.
+        
+        Args:
+            urls (List[str]): Lista de URLs
+            info_executor (ThreadPoolExecutor): Hilo de consultas de información
+            info_futures (Dict): Futuros de get_video_info por índice de URL
+            output_format (str): Formato de salida
+            quality (str): Calidad
+            output_path (str): Ruta de destino
+            progress_callback (callable): Callback de progreso
+        """
         for i, url in enumerate(urls):
-            if not self.is_running:
+            if self._cancel.is_set():
                 break
                 
             self.current_index = i + 1
@@ -221,7 +791,15 @@ class BatchDownloader:
             
             try:
                 # Detectar tipo de contenido
-                info = self.downloader.get_video_info(url)
+                for ahead in range(i, min(i + BATCH_PREFETCH_AHEAD + 1, len(urls))):
+                    if ahead not in info_futures:
+                        info_futures[ahead] = info_executor.submit(
+                            self.downloader.get_video_info, urls[ahead]
+                        )
+                try:
+                    info = info_futures.pop(i).result()
+                except CancelledError:
+                    break  # Lote detenido mientras se esperaba la información
                 if not info:
                     self.results.append({
                         'url': url,
@@ -262,12 +840,14 @@ class BatchDownloader:
                     'error': str(e)
                 })
                 
-        self.is_running = False
-        return self.results
-        
     def stop(self):
         """Detener descarga de lotes"""
+        self._cancel.set()
         self.is_running = False
+        
+        # Las consultas de información pendientes ya no son necesarias
+        for future in list(self._info_futures.values()):
+            future.cancel()
         self.downloader.cancel_current_download()
 
 
@@ -281,17 +861,35 @@ class QualityAnalyzer:
         """
         Analizar calidad de archivo de audio
         
+        MP3, FLAC y M4A se leen directamente de sus cabeceras; el resto
+        de formatos (o cabeceras no reconocidas) se analiza con mutagen.
+        
         Args:
             file_path (Path): Ruta del archivo
             
         Returns:
             Dict: Información de calidad
         """
-        try:
-            import mutagen
-            from mutagen import File
+        parser = _HEADER_PARSERS.get(file_path.suffix.lower())
+        if parser:
+            try:
+                with open(file_path, 'rb') as f:
+                    info = parser(f)
+                    if info:
+                        info['file_size'] = os.fstat(f.fileno()).st_size
+            except OSError as e:
+                return {'error': str(e)}
+            except (IndexError, ValueError, ZeroDivisionError):
+                info = None  # Cabecera no reconocida: se intenta con mutagen
+                
+            if info:
+                return info
+                
+        if _mutagen_File is None:
+            return {'error': 'mutagen no instalado'}
             
-            audio_file = File(str(file_path))
+        try:
+            audio_file = _mutagen_File(str(file_path))
             if audio_file is None:
                 return {'error': 'Archivo no soportado'}
             
@@ -305,53 +903,94 @@ class QualityAnalyzer:
             
             return info
             
-        except ImportError:
-            return {'error': 'mutagen no instalado'}
         except Exception as e:
             return {'error': str(e)}
             
-    def get_quality_report(self) -> Dict:
+    def get_quality_report(self, records: Optional[List[_FileRecord]] = None) -> Dict:
         """
         Generar reporte de calidad de todos los archivos
         
+        Args:
+            records (List[_FileRecord]): Recorrido ya hecho con _scan (opcional)
+            
         Returns:
             Dict: Reporte completo
         """
-        audio_extensions = ['.mp3', '.flac', '.wav', '.m4a', '.ogg']
         files_analyzed = 0
         total_duration = 0
+        bitrate_sum = 0
+        bitrate_count = 0
         quality_distribution = {}
         
-        for file_path in self.base_path.rglob('*'):
-            if file_path.suffix.lower() in audio_extensions:
-                analysis = self.analyze_audio_quality(file_path)
+        # Caché persistente: {ruta: [mtime_ns, tamaño, análisis]}
+        cache = load_json_file(QUALITY_CACHE_FILE) or {}
+        updated_cache = {}
+        analyses = []
+        pending = []
+        
+        if records is None:
+            records = _scan(str(self.base_path))
+            
+        for record in records:
+            # La extensión ya viene en minúsculas del recorrido: sin Path ni lower()
+            if record.is_dir or not record.suffix.endswith(AUDIO_SUFFIXES):
+                continue
+                
+            cached = cache.get(record.path)
+            if cached and cached[0] == record.mtime_ns and cached[1] == record.size:
+                analyses.append(cached[2])
+                updated_cache[record.path] = cached
+            else:
+                pending.append(record)
+                
+        # Solo se analizan los archivos nuevos o modificados; la lectura de
+        # cabeceras es I/O bloqueante y se solapa en varios hilos
+        if pending:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(self.analyze_audio_quality,
+                                       [Path(record.path) for record in pending])
+                for record, analysis in zip(pending, results):
+                    analyses.append(analysis)
+                    if 'error' not in analysis:
+                        updated_cache[record.path] = [record.mtime_ns, record.size, analysis]
+                        
+        # Reescribir solo si algo cambió (archivos nuevos, modificados o borrados)
+        if updated_cache != cache:
+            save_json_file(updated_cache, QUALITY_CACHE_FILE, compact=True)
+            
+        for analysis in analyses:
+            if 'error' not in analysis:
+                files_analyzed += 1
+                total_duration += analysis.get('duration', 0)
                 
-                if 'error' not in analysis:
-                    files_analyzed += 1
-                    total_duration += analysis.get('duration', 0)
+                # Clasificar por bitrate (el análisis lo da en bps)
+                bitrate = analysis.get('bitrate', 0) / 1000
+                if bitrate > 0:
+                    bitrate_sum += bitrate
+                    bitrate_count += 1
                     
-                    # Clasificar por bitrate
-                    bitrate = analysis.get('bitrate', 0)
-                    if bitrate > 0:
-                        if bitrate >= 320:
-                            quality = 'Muy Alta (320+ kbps)'
-                        elif bitrate >= 256:
-                            quality = 'Alta (256+ kbps)'
-                        elif bitrate >= 192:
-                            quality = 'Buena (192+ kbps)'
-                        elif bitrate >= 128:
-                            quality = 'Estándar (128+ kbps)'
-                        else:
-                            quality = 'Baja (<128 kbps)'
-                            
-                        quality_distribution[quality] = quality_distribution.get(quality, 0) + 1
+                    if bitrate >= 320:
+                        quality = 'Muy Alta (320+ kbps)'
+                    elif bitrate >= 256:
+                        quality = 'Alta (256+ kbps)'
+                    elif bitrate >= 192:
+                        quality = 'Buena (192+ kbps)'
+                    elif bitrate >= 128:
+                        quality = 'Estándar (128+ kbps)'
+                    else:
+                        quality = 'Baja (<128 kbps)'
+                        
+                    quality_distribution[quality] = quality_distribution.get(quality, 0) + 1
+        
+        hours, remainder = divmod(int(total_duration), 3600)
         
         return {
             'files_analyzed': files_analyzed,
             'total_duration': total_duration,
-            'total_duration_formatted': f"{total_duration // 3600:.0f}h {(total_duration % 3600) // 60:.0f}m",
+            'total_duration_formatted': f"{hours}h {remainder // 60}m",
             'quality_distribution': quality_distribution,
-            'average_bitrate': sum(int(k.split('(')[1].split('+')[0]) * v for k, v in quality_distribution.items() if '(' in k) / max(files_analyzed, 1)
+            'average_bitrate': bitrate_sum / bitrate_count if bitrate_count else 0
         }
 
 
@@ -374,21 +1013,25 @@ class MaintenanceManager:
         """
         results = {}
         
+        # Un único recorrido compartido por todos los pasos; los pasos de
+        # limpieza quitan de la lista lo que eliminan
+        records = _scan(str(self.file_manager.base_path))
+        
         if progress_callback:
             progress_callback("Limpiando archivos temporales...")
-        results['temp_files_deleted'] = self.file_manager.clean_temp_files()
+        results['temp_files_deleted'] = self.file_manager.clean_temp_files(records)
         
         if progress_callback:
             progress_callback("Eliminando carpetas vacías...")
-        results['empty_folders_deleted'] = self.file_manager.clean_empty_folders()
+        results['empty_folders_deleted'] = self.file_manager.clean_empty_folders(records)
         
         if progress_callback:
             progress_callback("Analizando calidad de archivos...")
-        results['quality_report'] = self.quality_analyzer.get_quality_report()
+        results['quality_report'] = self.quality_analyzer.get_quality_report(records)
         
         if progress_callback:
             progress_callback("Obteniendo información de almacenamiento...")
-        results['storage_info'] = self.file_manager.get_storage_info()
+        results['storage_info'] = self.file_manager.get_storage_info(records)
         
         if progress_callback:
             progress_callback("Mantenimiento completado")
@@ -408,12 +1051,17 @@ class MaintenanceManager:
         deleted_count = 0
         cutoff_time = time.time() - (days_old * 24 * 3600)
         
-        for log_file in LOGS_DIR.glob('*.log'):
-            try:
-                if log_file.stat().st_mtime < cutoff_time:
-                    log_file.unlink()
-                    deleted_count += 1
-            except (OSError, PermissionError):
-                continue
+        try:
+            with os.scandir(LOGS_DIR) as it:
+                for entry in it:
+                    try:
+                        if (entry.name.endswith('.log') and entry.is_file()
+                                and entry.stat().st_mtime < cutoff_time):
+                            os.unlink(entry.path)
+                            deleted_count += 1
+                    except (OSError, PermissionError):
+                        continue
+        except OSError:
+            pass  # Carpeta de logs inaccesible
                 
         return deleted_count
\ No newline at end of file
@@ -7,19 +7,34 @@ Interfaz básica y funcional para el descargador de YouTube.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+from tkinter import font as tkfont
 import threading
+import queue
 import logging
+from collections import deque
 import os
 from pathlib import Path
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 
 from ..core.downloader import YouTubeDownloader
 from ..core.config import AUDIO_FORMATS, VIDEO_FORMATS, VIDEO_QUALITIES
 from ..utils.helpers import (
-    is_valid_youtube_url, select_folder, format_duration,
-    SettingsManager
+    is_valid_youtube_url, select_folder, format_duration, format_file_size,
+    open_folder, SettingsManager
 )
 
+# Opciones de los selectores de formato y calidad (fijas durante la ejecución)
+_FORMAT_CHOICES = (*AUDIO_FORMATS, *VIDEO_FORMATS)
+_QUALITY_CHOICES = ('128', '192', '256', '320', *VIDEO_QUALITIES)
+
+# Intervalo (ms) con el que la interfaz aplica el progreso acumulado
+_PROGRESS_POLL_MS = 50
+
+# Intervalo (ms) de volcado de mensajes al log y líneas máximas que se conservan
+_LOG_FLUSH_MS = 100
+_MAX_LOG_LINES = 1000
+
 
 class ModernProgressBar(ttk.Frame):
     """Barra de progreso moderna con información detallada"""
@@ -48,25 +63,25 @@ class ModernProgressBar(ttk.Frame):
         self.stats_label = ttk.Label(self.info_frame, text="")
         self.stats_label.pack(side='right')
         
+        # Último nombre de archivo recibido y su versión abreviada
+        self._last_filename = None
+        self._display_filename = ''
+        
     def update_progress(self, data: Dict[str, Any]):
         """Actualizar información de progreso"""
         if data['status'] == 'downloading':
-            # Extraer porcentaje del string (ej: "45.2%")
-            percent_str = data.get('percent', '0%').replace('%', '')
-            try:
-                percent = float(percent_str)
-                self.progress_var.set(percent)
-            except ValueError:
-                pass
+            self.progress_var.set(data.get('percent', 0.0))
                 
-            # Actualizar labels
-            filename = Path(data.get('filename', '')).name
-            if len(filename) > 50:
-                filename = filename[:47] + "..."
-            self.file_label.config(text=f"Descargando: {filename}")
+            # Actualizar labels; el nombre solo se recalcula cuando cambia de archivo
+            filename = data.get('filename', '')
+            if filename != self._last_filename:
+                self._last_filename = filename
+                name = os.path.basename(filename)
+                self._display_filename = name if len(name) <= 50 else name[:47] + "..."
+                self.file_label.config(text=f"Descargando: {self._display_filename}")
             
-            speed = data.get('speed', '')
-            eta = data.get('eta', '')
+            speed = f"{format_file_size(int(data.get('speed', 0)))}/s"
+            eta = format_duration(int(data.get('eta', 0)))
             files_info = f"{data.get('completed_files', 0)}/{data.get('total_files', 0)}"
             
             stats_text = f"Velocidad: {speed} | ETA: {eta} | Archivos: {files_info}"
@@ -75,6 +90,7 @@ class ModernProgressBar(ttk.Frame):
         elif data['status'] == 'finished':
             files_info = f"{data.get('completed_files', 0)}/{data.get('total_files', 0)}"
             self.file_label.config(text="Descarga completada")
+            self._last_filename = None
             self.stats_label.config(text=f"Archivos completados: {files_info}")
             
             if data.get('completed_files', 0) >= data.get('total_files', 1):
@@ -84,6 +100,7 @@ class ModernProgressBar(ttk.Frame):
         """Resetear barra de progreso"""
         self.progress_var.set(0)
         self.file_label.config(text="Esperando...")
+        self._last_filename = None
         self.stats_label.config(text="")
 
 
@@ -108,6 +125,18 @@ class YouTubeDownloaderGUI:
         # Estado de descarga
         self.is_downloading = False
         
+        # Eventos de progreso enviados desde los hilos de descarga
+        self._progress_queue = queue.Queue()
+        
+        # Mensajes pendientes de escribir en el área de logs
+        self._log_queue = deque()
+        
+        # Consultas de información: una a la vez, sin repetir la que está en curso.
+        # _info_request guarda (url, futuro) de la última para que la descarga
+        # pueda reutilizarla
+        self._info_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='info')
+        self._info_request = None
+        
         self._setup_gui()
         self._setup_callbacks()
         
@@ -122,6 +151,15 @@ class YouTubeDownloaderGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
+        # Fuentes creadas una sola vez y compartidas por nombre entre widgets
+        self._title_font = tkfont.Font(family='TkDefaultFont', size=16, weight='bold')
+        self._entry_font = tkfont.Font(family='TkDefaultFont', size=10)
+        self._bold_font = tkfont.Font(family='TkDefaultFont', size=10, weight='bold')
+        self._help_font = tkfont.Font(family='TkDefaultFont', size=8)
+        style.configure('Title.TLabel', font=self._title_font)
+        style.configure('Bold.TLabel', font=self._bold_font)
+        style.configure('Help.TLabel', font=self._help_font)
+        
         # Crear frame principal
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.pack(fill='both', expand=True)
@@ -153,6 +191,7 @@ class YouTubeDownloaderGUI:
         tools_menu.add_command(label="Abrir carpeta de descargas", command=self._open_downloads_folder)
         tools_menu.add_separator()
         tools_menu.add_command(label="Limpiar logs", command=self._clear_logs)
+        tools_menu.add_command(label="Limpiar caché de información", command=self._clear_info_cache)
         
         # Menú Ayuda
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -166,7 +205,7 @@ class YouTubeDownloaderGUI:
         
         # Título principal
         title_label = ttk.Label(header_frame, text="🎵 YouTube Downloader", 
-                               font=('TkDefaultFont', 16, 'bold'))
+                               style='Title.TLabel')
         title_label.pack()
         
         subtitle_label = ttk.Label(header_frame, text="Descarga videos y playlists de YouTube en alta calidad")
@@ -181,7 +220,7 @@ class YouTubeDownloaderGUI:
         url_entry_frame = ttk.Frame(url_frame)
         url_entry_frame.pack(fill='x')
         
-        self.url_entry = ttk.Entry(url_entry_frame, textvariable=self.url_var, font=('TkDefaultFont', 10))
+        self.url_entry = ttk.Entry(url_entry_frame, textvariable=self.url_var, font=self._entry_font)
         self.url_entry.pack(side='left', fill='x', expand=True)
         
         # Botón de pegar
@@ -194,7 +233,7 @@ class YouTubeDownloaderGUI:
         
         # Etiqueta de ayuda
         help_label = ttk.Label(url_frame, text="Pega aquí la URL del video o playlist de YouTube", 
-                              font=('TkDefaultFont', 8))
+                              style='Help.TLabel')
         help_label.pack(pady=(5, 0))
         
     def _create_options_section(self):
@@ -209,13 +248,13 @@ class YouTubeDownloaderGUI:
         # Formato
         ttk.Label(row1_frame, text="Formato:").pack(side='left')
         format_combo = ttk.Combobox(row1_frame, textvariable=self.format_var, state='readonly', width=10)
-        format_combo['values'] = list(AUDIO_FORMATS.keys()) + list(VIDEO_FORMATS.keys())
+        format_combo['values'] = _FORMAT_CHOICES
         format_combo.pack(side='left', padx=(5, 20))
         
         # Calidad
         ttk.Label(row1_frame, text="Calidad:").pack(side='left')
         quality_combo = ttk.Combobox(row1_frame, textvariable=self.quality_var, state='readonly', width=10)
-        quality_combo['values'] = ['128', '192', '256', '320'] + list(VIDEO_QUALITIES.keys())
+        quality_combo['values'] = _QUALITY_CHOICES
         quality_combo.pack(side='left', padx=(5, 0))
         
         # Segunda fila: Carpeta de destino
@@ -303,14 +342,55 @@ class YouTubeDownloaderGUI:
             messagebox.showerror("Error", "URL no válida")
             return
             
-        def get_info():
-            info = self.downloader.get_video_info(url)
+        # La misma URL ya se está consultando: su resultado se mostrará al terminar
+        request = self._info_request
+        if request is not None and not request[1].done():
+            if url == request[0]:
+                return
+            request[1].cancel()  # Solo surte efecto si aún no empezó
+            
+        def on_done(future):
+            if future.cancelled():
+                return
+            info = future.result()
             if info:
                 self.root.after(0, lambda: self._show_video_info(info))
             else:
                 self.root.after(0, lambda: messagebox.showerror("Error", "No se pudo obtener información"))
                 
-        threading.Thread(target=get_info, daemon=True).start()
+        # get_video_info guarda en caché el resultado, así que repetir la
+        # consulta de una URL ya vista no vuelve a tocar la red
+        future = self._info_executor.submit(self.downloader.get_video_info, url)
+        self._info_request = (url, future)
+        future.add_done_callback(on_done)
+        
+    def _lookup_info(self, url: str):
+        """
+        Obtener información reutilizando la consulta del botón Info
+        
+        Si la última consulta es de la misma URL se espera su resultado en
+        lugar de lanzar otra extracción en paralelo; si no, se usa
+        get_video_info (con su caché por URL).
+        
+        Args:
+            url (str): URL del video o playlist
+            
+        Returns:
+            Dict: Información del video/playlist o None si hay error
+        """
+        request = self._info_request
+        if request is not None and request[0] == url:
+            try:
+                return request[1].result()
+            except CancelledError:
+                pass
+        return self.downloader.get_video_info(url)
+        
+    def _clear_info_cache(self):
+        """Vaciar la caché de información de videos"""
+        self.downloader.clear_info_cache()
+        self._info_request = None
+        self._log_message("🧹 Caché de información vaciada")
         
     def _show_video_info(self, info: Dict):
         """Mostrar información del video en una ventana"""
@@ -328,7 +408,7 @@ class YouTubeDownloaderGUI:
         duration = format_duration(info.get('duration', 0))
         view_count = info.get('view_count', 0)
         
-        ttk.Label(frame, text=f"Título: {title}", font=('TkDefaultFont', 10, 'bold')).pack(anchor='w')
+        ttk.Label(frame, text=f"Título: {title}", style='Bold.TLabel').pack(anchor='w')
         ttk.Label(frame, text=f"Canal: {uploader}").pack(anchor='w')
         ttk.Label(frame, text=f"Duración: {duration}").pack(anchor='w')
         ttk.Label(frame, text=f"Visualizaciones: {view_count:,}").pack(anchor='w')
@@ -340,7 +420,7 @@ class YouTubeDownloaderGUI:
         
     def _browse_folder(self):
         """Seleccionar carpeta de destino"""
-        folder = select_folder()
+        folder = select_folder(parent=self.root)
         if folder:
             self.output_path_var.set(folder)
             self._log_message(f"📁 Carpeta seleccionada: {folder}")
@@ -387,18 +467,25 @@ class YouTubeDownloaderGUI:
         try:
             format_type = self.format_var.get()
             quality = self.quality_var.get()
+            write_metadata = self.settings.get('save_metadata', True)
             
-            # Detectar si es playlist
-            info = self.downloader.get_video_info(url)
+            # Detectar si es playlist (reutiliza la información ya consultada)
+            info = self._lookup_info(url)
             is_playlist = info and 'entries' in info
             
             if is_playlist:
+                # Las entradas se descargan en el pool del downloader, limitado
+                # por el número de descargas simultáneas configurado
                 success = self.downloader.download_playlist(
-                    url, format_type, quality, output_path
+                    url, format_type, quality, output_path,
+                    skip_existing=self.settings.get('skip_existing', True),
+                    max_workers=self.settings.get('max_concurrent_downloads', 3),
+                    write_metadata=write_metadata
                 )
             else:
                 success = self.downloader.download_single_video(
-                    url, format_type, quality, output_path
+                    url, format_type, quality, output_path,
+                    write_metadata=write_metadata
                 )
                 
             # Actualizar interfaz en hilo principal
@@ -429,18 +516,51 @@ class YouTubeDownloaderGUI:
             self._log_message("⏹️ Cancelando descarga...")
             
     def _update_progress(self, data: Dict[str, Any]):
-        """Actualizar barra de progreso"""
-        self.root.after(0, lambda: self.progress_bar.update_progress(data))
+        """Encolar progreso (se llama desde los hilos de descarga)"""
+        self._progress_queue.put(data)
+        
+    def _poll_progress(self):
+        """Aplicar el último progreso encolado y reprogramar el sondeo"""
+        latest = None
+        while True:
+            try:
+                latest = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+                
+        # Solo el evento más reciente: los anteriores ya están desactualizados
+        if latest is not None:
+            self.progress_bar.update_progress(latest)
+            
+        self.root.after(_PROGRESS_POLL_MS, self._poll_progress)
         
     def _log_message(self, message: str):
-        """Agregar mensaje al log"""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+        """Agregar mensaje al log (se escribe en el siguiente volcado)"""
+        self._log_queue.append(message)
+        
+    def _flush_logs(self):
+        """Escribir los mensajes pendientes de una vez y reprogramar el volcado"""
+        if self._log_queue:
+            lines = []
+            while self._log_queue:
+                lines.append(self._log_queue.popleft())
+                
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            
+            # Descartar las líneas más antiguas por encima del límite
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > _MAX_LOG_LINES:
+                self.log_text.delete('1.0', f'{line_count - _MAX_LOG_LINES}.0')
+                
+            self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+            
+        self.root.after(_LOG_FLUSH_MS, self._flush_logs)
         
     def _clear_logs(self):
         """Limpiar área de logs"""
+        self._log_queue.clear()
         self.log_text.config(state='normal')
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state='disabled')
@@ -460,10 +580,10 @@ class YouTubeDownloaderGUI:
     def _open_downloads_folder(self):
         """Abrir carpeta de descargas"""
         path = self.output_path_var.get()
-        if path and Path(path).exists():
-            os.startfile(path)  # Windows
-        else:
+        if not path or not os.path.isdir(path):
             messagebox.showerror("Error", "Carpeta no encontrada")
+        elif not open_folder(path):
+            messagebox.showerror("Error", "No se pudo abrir la carpeta")
             
     def _show_about(self):
         """Mostrar información sobre la aplicación"""
@@ -487,17 +607,25 @@ Desarrollado con Python y tkinter
         
     def _on_closing(self):
         """Manejar cierre de aplicación"""
+        # Escribir configuraciones con guardado diferido pendiente
+        self.settings.flush()
+        
         if self.is_downloading:
-            if messagebox.askyesno("Confirmar", "Hay una descarga en progreso. ¿Salir de todas formas?"):
-                self.downloader.cancel_current_download()
-                self.root.destroy()
-        else:
-            self.root.destroy()
+            if not messagebox.askyesno("Confirmar", "Hay una descarga en progreso. ¿Salir de todas formas?"):
+                return
+            self.downloader.cancel_current_download()
+            
+        if self._info_request is not None:
+            self._info_request[1].cancel()
+        self._info_executor.shutdown(wait=False)
+        self.root.destroy()
             
     def run(self):
         """Ejecutar la aplicación"""
         self._log_message("🚀 YouTube Downloader iniciado")
         self._log_message("📝 Pega una URL de YouTube para comenzar")
+        self._poll_progress()
+        self._flush_logs()
         self.root.mainloop()
 
 
@@ -11,15 +11,44 @@ Fecha: 2025
 
 import re
 import os
+import sys
+import subprocess
 import json
 import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, List
 from urllib.parse import urlparse, parse_qs
-import tkinter as tk
-from tkinter import filedialog
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa json de la librería estándar
+    orjson = None
 
+
+# Dominios aceptados y prefijos de ruta de canales (/channel, /c, /@)
+_YOUTUBE_HOSTS = frozenset(('youtube.com', 'www.youtube.com'))
+_CHANNEL_PREFIXES = ('/channel/', '/c/', '/@')
+
+# ID de video (11 caracteres), patrones en orden de prioridad
+_VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'),
+    re.compile(r'(?:embed\/)([0-9A-Za-z_-]{11})'),
+    re.compile(r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})'),
+)
+
+_PLAYLIST_ID_RE = re.compile(r'list=([0-9A-Za-z_-]+)')
+
+# Unidades de format_file_size (potencias de 1024)
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Caracteres no permitidos en nombres de archivo, reemplazados por '_'
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+
+@lru_cache(maxsize=256)
 def is_valid_youtube_url(url: str) -> bool:
     """
     Validar si una URL es válida de YouTube
@@ -30,18 +59,36 @@ def is_valid_youtube_url(url: str) -> bool:
     Returns:
         bool: True si la URL es válida
     """
-    patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/playlist\?list=[\w-]+',
-        r'(?:https?://)?youtu\.be/[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/channel/[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/c/[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/@[\w-]+',
-    ]
+    try:
+        parsed = urlparse(url if '://' in url else 'https://' + url)
+    except ValueError:
+        return False
+        
+    if parsed.scheme not in ('http', 'https'):
+        return False
+        
+    host = parsed.netloc.lower()
+    path = parsed.path
     
-    return any(re.match(pattern, url) for pattern in patterns)
-
-
+    # Enlaces cortos: youtu.be/<id>
+    if host == 'youtu.be':
+        return len(path) > 1
+        
+    if host not in _YOUTUBE_HOSTS:
+        return False
+        
+    # Videos (/watch?v=), playlists (/playlist?list=) y canales
+    if path == '/watch':
+        return bool(parse_qs(parsed.query).get('v'))
+    if path == '/playlist':
+        return bool(parse_qs(parsed.query).get('list'))
+    for prefix in _CHANNEL_PREFIXES:
+        if path.startswith(prefix):
+            return len(path) > len(prefix)
+    return False
+
+
+@lru_cache(maxsize=256)
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extraer ID de video de una URL de YouTube
@@ -52,19 +99,14 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         str: ID del video o None si no se encuentra
     """
-    patterns = [
-        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-        r'(?:embed\/)([0-9A-Za-z_-]{11})',
-        r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     return None
 
 
+@lru_cache(maxsize=256)
 def extract_playlist_id(url: str) -> Optional[str]:
     """
     Extraer ID de playlist de una URL de YouTube
@@ -75,7 +117,7 @@ def extract_playlist_id(url: str) -> Optional[str]:
     Returns:
         str: ID de la playlist o None si no se encuentra
     """
-    match = re.search(r'list=([0-9A-Za-z_-]+)', url)
+    match = _PLAYLIST_ID_RE.search(url)
     return match.group(1) if match else None
 
 
@@ -115,14 +157,12 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
         
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
+    # Cada unidad son 10 bits más: el índice sale directamente del
+    # bit_length de la parte entera; se divide el valor original
+    whole = int(size_bytes)
+    i = min((whole.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if whole > 0 else 0
     
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-        
-    return f"{size_bytes:.1f} {size_names[i]}"
+    return f"{size_bytes / float(1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def sanitize_filename(filename: str) -> str:
@@ -135,11 +175,7 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Nombre de archivo limpio
     """
-    # Caracteres no permitidos en nombres de archivo
-    invalid_chars = r'<>:"/\\|?*'
-    
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    filename = filename.translate(_FILENAME_TRANS)
     
     # Limitar longitud
     if len(filename) > 200:
@@ -148,28 +184,100 @@ def sanitize_filename(filename: str) -> str:
     return filename.strip()
 
 
-def get_folder_size(folder_path: Path) -> int:
+def _iter_files(folder_path: Path):
     """
-    Calcular el tamaño total de una carpeta
+    Recorrer recursivamente los archivos de una carpeta con os.scandir
     
     Args:
         folder_path (Path): Ruta de la carpeta
         
-    Returns:
-        int: Tamaño total en bytes
+    Yields:
+        os.DirEntry: Cada archivo regular (sin seguir enlaces simbólicos)
     """
-    total_size = 0
+    stack = [str(folder_path)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    continue
+
+
+def _map_subtrees(folder_path: Path, func) -> list:
+    """
+    Aplicar una función a los archivos de cada subárbol en paralelo
+    
+    Los archivos del primer nivel forman un grupo y cada subcarpeta otro;
+    las subcarpetas se recorren en un pool de hilos para solapar la latencia
+    del disco (os.scandir y stat liberan el GIL).
     
+    Args:
+        folder_path (Path): Ruta de la carpeta
+        func (callable): Recibe un iterable de os.DirEntry de archivos
+        
+    Returns:
+        list: Resultado de func para cada grupo
+    """
+    top_files = []
+    subdirs = []
     try:
-        for file_path in folder_path.rglob('*'):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-    except (OSError, PermissionError):
-        pass
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        top_files.append(entry)
+                except OSError:
+                    continue
+    except OSError:
+        return []
         
+    results = [func(top_files)]
+    if subdirs:
+        max_workers = min(8, (os.cpu_count() or 1) * 2, len(subdirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results.extend(executor.map(lambda path: func(_iter_files(path)), subdirs))
+    return results
+
+
+def _sum_sizes(entries) -> int:
+    """Sumar el tamaño de archivos (os.DirEntry), omitiendo los inaccesibles"""
+    total_size = 0
+    for entry in entries:
+        try:
+            total_size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
     return total_size
 
 
+def _count_extensions(entries) -> Counter:
+    """Contar archivos (os.DirEntry) por extensión"""
+    return Counter(os.path.splitext(entry.name)[1].lower() for entry in entries)
+
+
+def get_folder_size(folder_path: Path) -> int:
+    """
+    Calcular el tamaño total de una carpeta
+    
+    Args:
+        folder_path (Path): Ruta de la carpeta
+        
+    Returns:
+        int: Tamaño total en bytes
+    """
+    return sum(_map_subtrees(folder_path, _sum_sizes))
+
+
 def count_files_by_extension(folder_path: Path) -> Dict[str, int]:
     """
     Contar archivos por extensión en una carpeta
@@ -180,62 +288,112 @@ def count_files_by_extension(folder_path: Path) -> Dict[str, int]:
     Returns:
         Dict[str, int]: Diccionario con conteo por extensión
     """
-    extensions = {}
+    extensions = Counter()
+    for counts in _map_subtrees(folder_path, _count_extensions):
+        extensions.update(counts)
+    return dict(extensions)
+
+
+def _run_dialog(dialog, parent, **options) -> str:
+    """
+    Mostrar un diálogo de tkinter sobre la ventana indicada
     
-    try:
-        for file_path in folder_path.rglob('*'):
-            if file_path.is_file():
-                ext = file_path.suffix.lower()
-                extensions[ext] = extensions.get(ext, 0) + 1
-    except (OSError, PermissionError):
-        pass
+    Sin ventana padre ni aplicación Tk en marcha se crea una raíz oculta
+    temporal solo para el diálogo.
+    
+    Args:
+        dialog (callable): Función de tkinter.filedialog
+        parent: Ventana padre (opcional)
+        **options: Opciones del diálogo
+        
+    Returns:
+        str: Resultado del diálogo
+    """
+    import tkinter as tk
+    
+    parent = parent or getattr(tk, '_default_root', None)
+    if parent is not None:
+        return dialog(parent=parent, **options)
         
-    return extensions
+    root = tk.Tk()
+    root.withdraw()  # Ocultar ventana principal
+    try:
+        return dialog(parent=root, **options)
+    finally:
+        root.destroy()
 
 
-def select_folder() -> Optional[str]:
+def select_folder(parent=None) -> Optional[str]:
     """
     Abrir diálogo para seleccionar carpeta
     
+    Args:
+        parent: Ventana padre del diálogo (opcional)
+        
     Returns:
         str: Ruta de la carpeta seleccionada o None
     """
-    root = tk.Tk()
-    root.withdraw()  # Ocultar ventana principal
+    from tkinter import filedialog
     
-    folder_path = filedialog.askdirectory(
+    folder_path = _run_dialog(
+        filedialog.askdirectory, parent,
         title="Seleccionar carpeta de destino"
     )
     
-    root.destroy()
     return folder_path if folder_path else None
 
 
-def select_file(filetypes: List[tuple] = None) -> Optional[str]:
+def select_file(filetypes: List[tuple] = None, parent=None) -> Optional[str]:
     """
     Abrir diálogo para seleccionar archivo
     
     Args:
         filetypes (List[tuple]): Tipos de archivo permitidos
+        parent: Ventana padre del diálogo (opcional)
         
     Returns:
         str: Ruta del archivo seleccionado o None
     """
-    root = tk.Tk()
-    root.withdraw()
+    from tkinter import filedialog
     
     if not filetypes:
         filetypes = [("Todos los archivos", "*.*")]
     
-    file_path = filedialog.askopenfilename(
+    file_path = _run_dialog(
+        filedialog.askopenfilename, parent,
         title="Seleccionar archivo",
         filetypes=filetypes
     )
     
-    root.destroy()
     return file_path if file_path else None
 
 
+def open_folder(path: str) -> bool:
+    """
+    Abrir una carpeta en el explorador de archivos del sistema
+    
+    El explorador se lanza como proceso independiente, sin esperar a que
+    termine, para no bloquear la interfaz.
+    
+    Args:
+        path (str): Ruta de la carpeta
+        
+    Returns:
+        bool: True si se pudo lanzar el explorador
+    """
+    try:
+        if sys.platform.startswith('win'):
+            os.startfile(path)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', path])
+        else:
+            subprocess.Popen(['xdg-open', path], start_new_session=True,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    except OSError:
+        return False
+
+
 def create_desktop_shortcut(name: str, target: str, icon: str = None):
     """
     Crear acceso directo en el escritorio (Windows)
@@ -276,34 +434,73 @@ def load_json_file(file_path: Path) -> Optional[Dict]:
         Dict: Contenido del archivo o None si hay error
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, PermissionError):
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        # orjson.JSONDecodeError hereda de json.JSONDecodeError
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError, PermissionError):
         return None
 
 
-def save_json_file(data: Dict, file_path: Path) -> bool:
+def _dump_json_bytes(data: Dict, compact: bool) -> bytes:
+    """
+    Serializar a JSON en UTF-8, con orjson si está disponible
+    
+    orjson rechaza claves que no son str y algunos tipos que json acepta
+    (claves int, por ejemplo); en ese caso se repite con json, que lanza
+    TypeError o ValueError si tampoco puede serializar los datos.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:  # orjson.JSONEncodeError hereda de TypeError
+            pass
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def save_json_file(data: Dict, file_path: Path, compact: bool = False) -> bool:
     """
     Guardar datos en archivo JSON
     
+    Se escribe en un archivo temporal de la misma carpeta, se sincroniza
+    con fsync y luego reemplaza al original con os.replace (atómico), así
+    un cierre inesperado nunca deja el archivo a medias.
+    
     Args:
         data (Dict): Datos a guardar
         file_path (Path): Ruta del archivo
+        compact (bool): Sin sangría, para archivos que no edita el usuario
         
     Returns:
         bool: True si se guardó correctamente
     """
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp_path, 'wb', buffering=1 << 16) as f:
+            f.write(_dump_json_bytes(data, compact))
+            # Asegurar los datos en disco antes del reemplazo
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
         return True
-    except (PermissionError, OSError):
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
         return False
 
 
 class ThreadSafeCounter:
-    """Contador thread-safe para operaciones concurrentes"""
+    """
+    Contador thread-safe para operaciones concurrentes
+    
+    Todas las operaciones se serializan con un único lock: así cada
+    increment() devuelve un valor distinto y value nunca retrocede.
+    """
     
     def __init__(self, initial_value: int = 0):
         self._value = initial_value
@@ -332,9 +529,19 @@ class ThreadSafeCounter:
 class SettingsManager:
     """Manejador de configuraciones de usuario"""
     
+    # Segundos de espera tras un set() antes de escribir el archivo; los
+    # cambios seguidos se agrupan en una sola escritura
+    SAVE_DELAY = 0.5
+    
     def __init__(self, settings_file: Path):
         self.settings_file = settings_file
         self.settings = self._load_settings()
+        # _lock protege el dict y el temporizador; _write_lock serializa las
+        # escrituras al archivo, que se hacen fuera de _lock con una copia
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
     
     def _load_settings(self) -> Dict:
         """Cargar configuraciones desde archivo"""
@@ -358,17 +565,52 @@ class SettingsManager:
     
     def save_settings(self) -> bool:
         """Guardar configuraciones actuales"""
-        return save_json_file(self.settings, self.settings_file)
+        with self._write_lock:
+            with self._lock:
+                self._cancel_save()
+                snapshot = dict(self.settings)
+            return save_json_file(snapshot, self.settings_file)
+            
+    def flush(self) -> bool:
+        """Guardar inmediatamente si hay cambios pendientes"""
+        if self._dirty:
+            return self.save_settings()
+        return True
+        
+    def _cancel_save(self):
+        """Cancelar el guardado pendiente (requiere tener _lock)"""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        self._dirty = False
+        
+    def _schedule_save(self):
+        """Programar un guardado diferido, reiniciando el pendiente (requiere tener _lock)"""
+        self._dirty = True
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
     
     def get(self, key: str, default=None):
         """Obtener valor de configuración"""
         return self.settings.get(key, default)
     
     def set(self, key: str, value):
-        """Establecer valor de configuración"""
-        self.settings[key] = value
+        """Establecer valor de configuración (se guarda de forma diferida)"""
+        with self._lock:
+            if self.settings.get(key) == value:
+                return
+            self.settings[key] = value
+            self._schedule_save()
     
     def reset_to_defaults(self):
         """Restablecer configuraciones por defecto"""
-        self.settings_file.unlink(missing_ok=True)
-        self.settings = self._load_settings()
\ No newline at end of file
+        with self._write_lock:
+            with self._lock:
+                self._cancel_save()
+            self.settings_file.unlink(missing_ok=True)
+            settings = self._load_settings()
+            with self._lock:
+                self.settings = settings
\ No newline at end of file